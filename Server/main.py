@@ -1,15 +1,23 @@
 from fastmcp import FastMCP # This is the MCP Library
 
-from dataclasses import dataclass
 from datetime import datetime, timezone
+import io
 import json
+import os
+import select
 import serial
 import threading
 import time
-import queue
 import logging
 
-from typing import Optional, Callable, Any, Dict
+from typing import Optional, Callable, Any, Dict, NamedTuple
+
+try:
+    import orjson  # Much faster JSON parser, accepts bytes directly
+except ImportError:
+    orjson = None
+
+loads = getattr(orjson, "loads", json.loads)
 
 logger = logging.getLogger("devaiot-mcp")
 logger.setLevel(logging.DEBUG)
@@ -17,23 +25,34 @@ logger.setLevel(logging.DEBUG)
 
 PORT='/dev/cu.usbmodem21201' # Change to your COM port
 
-@dataclass(frozen=True)
-class Vec3:
+# Looked up once instead of on every packet
+_UTC = timezone.utc
+_now = datetime.now
+
+# Fixed LED commands, encoded once
+_LED_ON = b"LED=ON\n"
+_LED_OFF = b"LED=OFF\n"
+_RGB_OFF = b"RGB=0,0,0\n"
+_RGB_RED = b"RGB=255,0,0\n"
+_RGB_YELLOW = b"RGB=255,255,0\n"
+
+
+# NamedTuples rather than frozen dataclasses: still immutable, but
+# tuple-backed, with no object.__setattr__ call per field on construction
+class Vec3(NamedTuple):
     x: float
     y: float
     z: float
 
 
-@dataclass(frozen=True)
-class ApdsColor:
+class ApdsColor(NamedTuple):
     r: int
     g: int
     b: int
     c: int
 
 
-@dataclass(frozen=True)
-class SensorPacket:
+class SensorPacket(NamedTuple):
     timestamp: datetime
 
     # HS3003
@@ -56,38 +75,38 @@ class SensorPacket:
 
 
 
-def parse_packet(line: str) -> Optional[SensorPacket]:
-    try:
-        obj = json.loads(line)  # type: Dict[str, Any]
-    except Exception:
-        return None
+def _make_builder() -> Callable[[Any, datetime], SensorPacket]:
+    # The packet schema is fixed, so generate one function that reads every
+    # key as a constant and fills the tuple positionally, instead of a
+    # keyword-argument SensorPacket(...) call per packet
+    values = ["ts"]
+    for name in SensorPacket._fields[1:]:
+        values.append("get({!r})".format(name))
 
-    return SensorPacket(
-        timestamp=datetime.now(timezone.utc),
+    src = (
+        "def _build(obj, ts):\n"
+        "    get = obj.get\n"
+        "    return _tuple_new(SensorPacket, ({},))\n"
+    ).format(", ".join(values))
+    namespace = {"SensorPacket": SensorPacket, "_tuple_new": tuple.__new__}
+    exec(src, namespace)
+    return namespace["_build"]
 
-        hs3003_t_c=obj.get("hs3003_t_c"),
-        hs3003_h_rh=obj.get("hs3003_h_rh"),
 
-        lps22hb_p_kpa=obj.get("lps22hb_p_kpa"),
-        lps22hb_t_c=obj.get("lps22hb_t_c"),
+_build_packet = _make_builder()
 
-        apds_prox=obj.get("apds_prox"),
-        apds_color=obj.get("apds_color"),
-        apds_gesture=obj.get("apds_gesture"),
-
-        acc_g=obj.get("acc_g"),
-        gyro_dps=obj.get("gyro_dps"),
-        mag_uT=obj.get("mag_uT"),
-    )
 
+def parse_packet(raw: bytes) -> Optional[SensorPacket]:
+    # orjson and json both take bytes, so the line is never decoded to str here
+    line = raw.rstrip()
+    try:
+        obj = loads(line)  # type: Dict[str, Any]
+    except (ValueError, RecursionError):  # stdlib json recurses on deep nesting
+        return None
+    if not isinstance(obj, dict):
+        return None
 
-def clear_queue(q: queue.Queue):
-    while True:
-        try:
-            q.get_nowait()
-            q.task_done()
-        except queue.Empty:
-            break
+    return _build_packet(obj, _now(_UTC))
 
 
 class Nano33SenseRev2:
@@ -103,74 +122,130 @@ class Nano33SenseRev2:
         self.debug_nonjson = debug_nonjson
         self._running = True
 
-        self._latest_pkt = queue.Queue(maxsize=1)
+        # Single latest-value slot; a plain attribute store is atomic under
+        # the GIL so the reader does not need to take a lock to publish
+        self._latest_pkt: Optional[SensorPacket] = None
+        self._pkt_ready = threading.Event()
 
+        # Bytes read from the port, waiting to be split and parsed
+        self._rx_buf = bytearray()
+        self._rx_lock = threading.Lock()
+        self._lines_ready = threading.Event()
 
         self._thread = threading.Thread(target=self._read_loop, daemon=True)
+        self._parse_thread = threading.Thread(target=self._parse_loop, daemon=True)
         self._thread.start()
+        self._parse_thread.start()
 
     # ----- commands -----
     def led_on(self) -> None:
-        self._send("LED=ON")
+        self.ser.write(_LED_ON)
 
     def led_off(self) -> None:
-        self._send("LED=OFF")
+        self.ser.write(_LED_OFF)
 
     def rgb(self, r: int, g: int, b: int) -> None:
         r = max(0, min(255, int(r)))
         g = max(0, min(255, int(g)))
         b = max(0, min(255, int(b)))
-        self._send("RGB={},{},{}".format(r, g, b))
+        self.ser.write(b"RGB=%d,%d,%d\n" % (r, g, b))
 
     def red_LED(self) -> None:
-        self.rgb(255, 0, 0)
+        self.ser.write(_RGB_RED)
 
     # TODO: Implement blue led
     
     def yellow_LED(self) -> None:
-        self.rgb(255, 255, 0)
+        self.ser.write(_RGB_YELLOW)
 
     def off(self) -> None:
-        self.rgb(0, 0, 0)
+        self.ser.write(_RGB_OFF)
 
     def get_state(self) -> Optional[SensorPacket]:
-        try:
-            value = self._latest_pkt.get(timeout=2)
-            self._latest_pkt.task_done()
-            return value
-        except queue.Empty:
+        if not self._pkt_ready.wait(timeout=2):
             return None
+        self._pkt_ready.clear()
+        return self._latest_pkt
 
         
 
 
     # ----- internals -----
-    def _send(self, msg: str) -> None:
-        if not msg.endswith("\n"):
-            msg += "\n"
-        self.ser.write(msg.encode("utf-8"))
-
     def _set_latest_package(self, pkt: SensorPacket) -> None:
-        clear_queue(self._latest_pkt)
-        self._latest_pkt.put(pkt, block=False)
+        self._latest_pkt = pkt
+        self._pkt_ready.set()
+
+    def _make_reader(self) -> Callable[[], bytes]:
+        def read_pyserial() -> bytes:
+            return self.ser.read(self.ser.in_waiting or 1)
+
+        # select() only works on sockets on Windows
+        if os.name != "posix":
+            return read_pyserial
+        try:
+            fd = self.ser.fileno()
+        except (AttributeError, io.UnsupportedOperation):
+            # No file descriptor (e.g. a serial_for_url port)
+            return read_pyserial
+
+        def read() -> bytes:
+            ready, _, _ = select.select([fd], [], [], 1)
+            if not ready:
+                return b""
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                # Same check pyserial does, otherwise we would spin forever
+                raise serial.SerialException("device reports readiness to read but returned no data")
+            return chunk
+
+        return read
 
     def _read_loop(self) -> None:
+        # Only moves bytes into the buffer; all parsing happens in
+        # _parse_loop so this thread gets straight back to the port
+        read = self._make_reader()
         while self._running:
-            raw = self.ser.readline()
-            if not raw:
+            chunk = read()
+            if not chunk:
                 continue
+            with self._rx_lock:
+                self._rx_buf.extend(chunk)
+            if b"\n" in chunk:
+                self._lines_ready.set()
 
-            line = raw.decode(errors="replace").strip()
-            pkt = parse_packet(line)
-            if pkt is not None:
-                if self.on_packet:
-                    self.on_packet(pkt)
-                self._set_latest_package(pkt)
-
-            else:
-                if self.debug_nonjson:
-                    logging.info("NONJSON: " + str(line))
-                    pass
+    def _parse_loop(self) -> None:
+        while self._running:
+            if not self._lines_ready.wait(timeout=1):
+                continue
+            self._lines_ready.clear()
+
+            # Take every complete line received so far in one go
+            with self._rx_lock:
+                end = self._rx_buf.rfind(b"\n")
+                if end == -1:
+                    continue
+                block = bytes(self._rx_buf[:end])
+                del self._rx_buf[:end + 1]
+
+            latest = None
+            for raw in block.split(b"\n"):
+                pkt = self._handle_line(raw)
+                if pkt is not None:
+                    latest = pkt
+            if latest is not None:
+                self._set_latest_package(latest)
+
+    def _handle_line(self, raw: bytes) -> Optional[SensorPacket]:
+        pkt = parse_packet(raw)
+        if pkt is not None:
+            if self.on_packet:
+                self.on_packet(pkt)
+
+        else:
+            if self.debug_nonjson:
+                logging.info("NONJSON: " + raw.decode(errors="replace").strip())
+                pass
+        return pkt
 
     def close(self) -> None:
         self._running = False
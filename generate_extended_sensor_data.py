@@ -2,13 +2,15 @@
 """
 Generate extended sensor data from Jan 1, 2026 to Feb 6, 2026
 Extends existing CSV files with realistic sensor readings
+
+Requires numpy: each room's readings are generated as whole arrays.
 """
 
 import csv
-import math
-import random
 from datetime import datetime, timedelta
 
+import numpy as np
+
 # Room configurations with temperature, humidity, and light characteristics
 ROOM_CONFIGS = {
     "synthetic_living_room_20260204_153610.csv": {
@@ -49,59 +51,85 @@ ROOM_CONFIGS = {
     }
 }
 
+# Seed for the random generator; set to an int to get reproducible output
+RANDOM_SEED = None
+
+# The daily cycle only depends on the whole hour, so every room shares
+# this 24-entry sine table instead of evaluating sin per reading
+DAILY_SIN = np.sin((np.arange(24) - 6) * np.pi / 12)
+
 def read_last_timestamp(filepath):
     """Read the last timestamp from existing CSV"""
     try:
-        with open(filepath, 'r') as f:
-            lines = f.readlines()
+        with open(filepath, 'rb') as f:
+            # Only read the end of the file, stepping back 4 KB at a time
+            # until the tail contains the whole last line
+            f.seek(0, 2)
+            size = f.tell()
+            offset = size
+            tail = b""
+            while offset > 0:
+                offset = max(0, offset - 4096)
+                f.seek(offset)
+                tail = f.read(size - offset).rstrip()
+                if b"\n" in tail:
+                    break
+            lines = tail.split(b"\n")
             if len(lines) > 1:
-                last_line = lines[-1].strip()
+                last_line = lines[-1].strip().decode()
                 timestamp_str = last_line.split(',')[0]
                 return datetime.fromisoformat(timestamp_str)
     except FileNotFoundError:
         print(f"Warning: {filepath} not found, will start from 2026-01-01")
     return datetime(2025, 12, 31, 23, 30, 0)
 
-def generate_temperature(hour, config, day_offset):
-    """Generate realistic temperature with daily cycle"""
+def seasonal_offset(day_offset):
+    """Seasonal temperature offset (winter = cooler) for an array of day offsets"""
+    if len(day_offset) == 0:
+        return np.zeros(0)
+
+    # Readings are in time order, so one sine per day covers all of them
+    first = day_offset[0]
+    per_day = -1.0 * np.sin(np.arange(first, day_offset[-1] + 1) * np.pi / 180)
+    return per_day[day_offset - first]
+
+def generate_temperature(daily_sin, seasonal, config, rng):
+    """Generate realistic temperature with daily cycle for an array of readings"""
     base = config["temp_base"]
     variation = config["temp_variation"]
 
     # Daily cycle: cooler at night, warmer during day
-    daily_cycle = math.sin((hour - 6) * math.pi / 12) * (variation / 2)
+    daily_cycle = daily_sin * (variation / 2)
 
     # Random noise
-    noise = random.gauss(0, variation / 4)
-
-    # Seasonal variation (winter = cooler)
-    seasonal = -1.0 * math.sin(day_offset * math.pi / 180)
+    noise = rng.normal(0, variation / 4, len(daily_sin))
 
     temp = base + daily_cycle + noise + seasonal
-    return round(max(15.0, min(35.0, temp)), 2)
+    return np.round(np.clip(temp, 15.0, 35.0), 2)
 
-def generate_humidity(hour, config, day_offset):
-    """Generate realistic humidity with daily cycle"""
+def generate_humidity(daily_sin, config, rng):
+    """Generate realistic humidity with daily cycle for an array of readings"""
     base = config["humidity_base"]
     variation = config["humidity_variation"]
+    n = len(daily_sin)
 
     # Daily cycle: higher at night, lower during day
-    daily_cycle = -math.sin((hour - 6) * math.pi / 12) * (variation / 3)
+    daily_cycle = -daily_sin * (variation / 3)
 
     # Random noise
-    noise = random.gauss(0, variation / 3)
+    noise = rng.normal(0, variation / 3, n)
 
     # Random spikes (e.g., shower in bathroom, cooking in kitchen)
-    spike = 0
-    if random.random() < 0.05:  # 5% chance of spike
-        spike = random.uniform(5, 15)
+    spike = np.where(rng.random(n) < 0.05, rng.uniform(5, 15, n), 0.0)  # 5% chance of spike
 
     humidity = base + daily_cycle + noise + spike
-    return round(max(20.0, min(95.0, humidity)), 2)
+    return np.round(np.clip(humidity, 20.0, 95.0), 2)
 
-def generate_light(hour, minute, config):
-    """Generate realistic light levels with day/night cycle"""
+def generate_light(hour, minute, config, rng):
+    """Generate realistic light levels with day/night cycle for an array of readings"""
     day_max = config["light_day_max"]
     night_min = config["light_night_min"]
+    n = len(hour)
 
     # Time as decimal hour
     time_decimal = hour + minute / 60.0
@@ -110,26 +138,27 @@ def generate_light(hour, minute, config):
     sunrise = 7.0
     sunset = 19.0
 
-    if time_decimal < sunrise or time_decimal > sunset:
-        # Night time - very low light
-        light = night_min + random.uniform(-5, 10)
-    elif time_decimal < sunrise + 1:
-        # Sunrise transition
-        progress = (time_decimal - sunrise)
-        light = night_min + (day_max - night_min) * progress + random.uniform(-50, 50)
-    elif time_decimal > sunset - 1:
-        # Sunset transition
-        progress = (sunset - time_decimal)
-        light = night_min + (day_max - night_min) * progress + random.uniform(-50, 50)
-    else:
-        # Daytime - high light with cloud variations
-        cloud_factor = random.uniform(0.7, 1.0)
-        light = day_max * cloud_factor + random.uniform(-100, 100)
-
-    return round(max(0, light), 0)
-
-def extend_csv_file(filepath, config, start_date, end_date):
+    # Night time - very low light
+    night = night_min + rng.uniform(-5, 10, n)
+    # Sunrise transition
+    rising = night_min + (day_max - night_min) * (time_decimal - sunrise) + rng.uniform(-50, 50, n)
+    # Sunset transition
+    setting = night_min + (day_max - night_min) * (sunset - time_decimal) + rng.uniform(-50, 50, n)
+    # Daytime - high light with cloud variations
+    cloud_factor = rng.uniform(0.7, 1.0, n)
+    day = day_max * cloud_factor + rng.uniform(-100, 100, n)
+
+    light = np.where((time_decimal < sunrise) | (time_decimal > sunset), night,
+            np.where(time_decimal < sunrise + 1, rising,
+            np.where(time_decimal > sunset - 1, setting, day)))
+
+    return np.round(np.maximum(light, 0), 0)
+
+def extend_csv_file(filepath, config, start_date, end_date, rng=None):
     """Extend a CSV file with new data"""
+    if rng is None:
+        rng = np.random.default_rng(RANDOM_SEED)
+
     print(f"\nProcessing {config['name']}...")
 
     # Read last timestamp from existing file
@@ -137,36 +166,51 @@ def extend_csv_file(filepath, config, start_date, end_date):
     print(f"  Last timestamp in file: {last_timestamp}")
 
     # Start from next 30-minute interval
-    current_time = last_timestamp + timedelta(minutes=30)
+    first_time = last_timestamp + timedelta(minutes=30)
 
-    # Generate data until end_date
-    new_rows = []
-    day_offset = 0
+    # Number of 30-minute readings up to and including end_date
+    step = timedelta(minutes=30)
+    n = max(0, (end_date - first_time) // step + 1)
 
-    while current_time <= end_date:
-        hour = current_time.hour
-        minute = current_time.minute
+    # Time of day and day offset (for seasonal effects) of every reading
+    steps = np.arange(n)
+    minute_of_day = first_time.hour * 60 + first_time.minute + steps * 30
+    hour = (minute_of_day // 60) % 24
+    minute = minute_of_day % 60
+    day_offset = ((first_time - start_date) // timedelta(minutes=1) + steps * 30) // (24 * 60)
 
-        # Calculate day offset for seasonal effects
-        day_offset = (current_time - start_date).days
+    # Trig terms come from lookup tables rather than one sin per reading
+    daily_sin = DAILY_SIN[hour]
+    seasonal = seasonal_offset(day_offset)
 
-        # Generate sensor values
-        temperature = generate_temperature(hour, config, day_offset)
-        humidity = generate_humidity(hour, config, day_offset)
-        light = generate_light(hour, minute, config)
+    # Generate sensor values for all readings at once
+    temperatures = generate_temperature(daily_sin, seasonal, config, rng)
+    humidities = generate_humidity(daily_sin, config, rng)
+    lights = generate_light(hour, minute, config, rng)
 
-        # Format row
-        timestamp_str = current_time.strftime("%Y-%m-%dT%H:%M:%S")
+    # Format rows
+    new_rows = []
+    current_time = first_time
+    current_date = None
+    for temperature, humidity, light in zip(temperatures.tolist(), humidities.tolist(), lights.tolist()):
+        # Same format as strftime("%Y-%m-%dT%H:%M:%S"), built from integers;
+        # the date part only changes once a day so it is formatted once a day
+        if current_time.date() != current_date:
+            current_date = current_time.date()
+            date_prefix = f"{current_date.year:04d}-{current_date.month:02d}-{current_date.day:02d}T"
+        timestamp_str = f"{date_prefix}{current_time.hour:02d}:{current_time.minute:02d}:{current_time.second:02d}"
         new_rows.append(f"{timestamp_str},{temperature},{humidity},{int(light)}")
 
         # Next reading (30 minutes later)
-        current_time += timedelta(minutes=30)
+        current_time += step
 
     # Append to existing file
     print(f"  Generated {len(new_rows)} new readings")
-    with open(filepath, 'a') as f:
-        for row in new_rows:
-            f.write(row + '\n')
+    if new_rows:
+        # Binary mode: one ASCII encode of the whole block, no per-write
+        # newline translation or text encoding
+        with open(filepath, 'ab') as f:
+            f.write(("\n".join(new_rows) + "\n").encode("ascii"))
 
     print(f"  ✓ Extended {config['name']} to {end_date}")
 
@@ -187,11 +231,15 @@ def main():
     print(f"Total days: {(end_date - start_date).days + 1}")
     print()
 
+    # One generator for all rooms, so a fixed seed does not give every
+    # room the same noise
+    rng = np.random.default_rng(RANDOM_SEED)
+
     # Process each room
     for filename, config in ROOM_CONFIGS.items():
         filepath = f"{base_path}/{filename}"
         try:
-            extend_csv_file(filepath, config, start_date, end_date)
+            extend_csv_file(filepath, config, start_date, end_date, rng)
         except Exception as e:
             print(f"  ✗ Error processing {filename}: {e}")
 